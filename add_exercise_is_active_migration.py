@@ -0,0 +1,20 @@
+"""
+Migration script to add is_active column to exercises table
+Run this once to update the database schema
+"""
+from app import app, db
+from models import Exercise
+
+with app.app_context():
+    # Check if column already exists
+    inspector = db.inspect(db.engine)
+    columns = [col['name'] for col in inspector.get_columns('exercises')]
+    
+    if 'is_active' not in columns:
+        print("Adding is_active column to exercises table...")
+        with db.engine.connect() as conn:
+            conn.execute(db.text('ALTER TABLE exercises ADD COLUMN is_active BOOLEAN NOT NULL DEFAULT 1'))
+            conn.commit()
+        print("Migration completed successfully!")
+    else:
+        print("is_active column already exists, no migration needed.")
@@ -1,9 +1,17 @@
 from flask import Flask
 from flask_login import LoginManager
-from models import db, User, WorkoutType, Exercise
+from models import db, User, WorkoutType
+from contextlib import contextmanager
 from datetime import datetime
+import gc
 import os
-import pandas as pd
+import catalog
+import query_budget
+
+try:
+    import fcntl
+except ImportError:  # Windows: the dev server is a single process, no lock needed
+    fcntl = None
 
 # Import blueprints
 from blueprints.main import main_bp
@@ -12,27 +20,51 @@ from blueprints.workouts import workouts_bp
 from blueprints.schedule import schedule_bp
 from blueprints.custom_workouts import custom_workouts_bp
 
-app = Flask(__name__)
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///fitness_tracker.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-db.init_app(app)
+EXERCISES_PATH = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'data', 'Comprehensive_Exercise_List.xlsx')
 
 login_manager = LoginManager()
-login_manager.init_app(app)
 login_manager.login_view = 'auth.login'
 
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
 
-# Register blueprints
-app.register_blueprint(main_bp)
-app.register_blueprint(auth_bp)
-app.register_blueprint(workouts_bp)
-app.register_blueprint(schedule_bp)
-app.register_blueprint(custom_workouts_bp)
+def create_app(config=None):
+    """Application factory: configure the app and register extensions and blueprints.
+
+    `config` overrides the defaults below, e.g. a separate database for tests.
+    """
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///fitness_tracker.db'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['CATALOG_CHECK_INTERVAL'] = 5  # seconds between checks of the exercise spreadsheet
+    app.config.update(config or {})
+
+    db.init_app(app)
+    login_manager.init_app(app)
+
+    # Register blueprints
+    app.register_blueprint(main_bp)
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(workouts_bp)
+    app.register_blueprint(schedule_bp)
+    app.register_blueprint(custom_workouts_bp)
+
+    @app.before_request
+    def refresh_exercise_catalog():
+        if catalog.source_changed(EXERCISES_PATH, app.config['CATALOG_CHECK_INTERVAL']):
+            # Never fail the user's request over the spreadsheet (e.g. one
+            # that is half-written); keep serving the current catalog.
+            try:
+                sync_exercises_from_excel(app)
+            except Exception:
+                app.logger.exception('Exercise catalog sync failed, will retry')
+                catalog.mark_check_failed()
+
+    query_budget.init_app(app)
+
+    return app
 
 def init_workout_types():
     """Initialize default workout types if none exist"""
@@ -50,35 +82,59 @@ def init_workout_types():
         db.session.add_all(default_types)
         db.session.commit()
 
-def load_exercises_from_excel():
-    """Load exercises from Excel file into database"""
-    if Exercise.query.count() == 0:
-        # Get the absolute path to the Excel file
-        base_dir = os.path.abspath(os.path.dirname(__file__))
-        excel_path = os.path.join(base_dir, 'data', 'Comprehensive_Exercise_List.xlsx')
-        
-        if os.path.exists(excel_path):
-            print(f"Loading exercises from: {excel_path}")
-            df = pd.read_excel(excel_path)
-            exercises = []
-            for _, row in df.iterrows():
-                exercise = Exercise(
-                    name=row['Exercise'],
-                    category=row['Category'],
-                    primary_muscle_groups=row['Primary Muscle Groups'],
-                    equipment=row['Equipment'],
-                    difficulty=row['Difficulty'],
-                    workout_goal=row['Workout Goal'],
-                    location=row['Location']
-                )
-                exercises.append(exercise)
-            db.session.add_all(exercises)
-            db.session.commit()
-            print(f"Loaded {len(exercises)} exercises from Excel file")
+def sync_exercises_from_excel(app):
+    """Sync the exercises table with the Excel file and swap in the new catalog"""
+    with bootstrap_lock(app):
+        catalog.sync_catalog(EXERCISES_PATH)
+    catalog.reload_catalog()
 
-if __name__ == '__main__':
-    with app.app_context():
+@contextmanager
+def bootstrap_lock(app):
+    """Hold an exclusive file lock in the instance folder for the duration of the block"""
+    os.makedirs(app.instance_path, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    lock_path = os.path.join(app.instance_path, 'bootstrap.lock')
+    with open(lock_path, 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def bootstrap(app):
+    """Create tables and seed default data.
+
+    Serialized behind a file lock so that concurrent processes (several
+    gunicorn masters, or workers started without --preload) never race on
+    schema creation or seeding; the seed steps themselves are idempotent.
+    """
+    with bootstrap_lock(app), app.app_context():
         db.create_all()
         init_workout_types()
-        load_exercises_from_excel()
+        catalog.sync_catalog(EXERCISES_PATH)
+        catalog.reload_catalog()
+
+def preload(app):
+    """Warm shared state in the master process before workers fork.
+
+    Compiles every template and loads the exercise catalog, then disposes of
+    the engine so no SQLite connection is inherited across fork, and freezes
+    the GC so collections in the workers don't touch (and copy) these pages.
+    """
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+    with app.app_context():
+        catalog.get_catalog()
+        db.engine.dispose()
+
+    gc.collect()
+    gc.freeze()
+
+app = create_app()
+
+if __name__ == '__main__':
+    bootstrap(app)
     app.run(host='0.0.0.0', port=5000, debug=True)
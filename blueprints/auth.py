@@ -2,11 +2,13 @@ from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from models import db, User
+from query_budget import budget
 from forms import LoginForm, RegisterForm
 
 auth_bp = Blueprint('auth', __name__)
 
 @auth_bp.route('/register', methods=['GET', 'POST'])
+@budget(3)
 def register():
     if current_user.is_authenticated:
         return redirect(url_for('workouts.dashboard'))
@@ -34,6 +36,7 @@ def register():
     return render_template('auth/register.html', form=form)
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
+@budget(1)
 def login():
     if current_user.is_authenticated:
         return redirect(url_for('workouts.dashboard'))
@@ -52,6 +55,7 @@ def login():
     return render_template('auth/login.html', form=form)
 
 @auth_bp.route('/logout')
+@budget(1)
 @login_required
 def logout():
     logout_user()
@@ -1,62 +1,42 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required, current_user
-from models import db, Exercise, CustomWorkout, CustomWorkoutExercise
+from sqlalchemy.orm import joinedload, selectinload
+from models import db, CustomWorkout, CustomWorkoutExercise
+from query_budget import budget
+from catalog import get_catalog
 
 custom_workouts_bp = Blueprint('custom_workouts', __name__)
 
 @custom_workouts_bp.route('/workout-designer')
+@budget(3)
 @login_required
 def workout_designer():
-    categories = db.session.query(Exercise.category).distinct().all()
-    categories = [c[0] for c in categories]
+    exercise_catalog = get_catalog()
     
-    difficulties = db.session.query(Exercise.difficulty).distinct().all()
-    difficulties = [d[0] for d in difficulties]
-    
-    equipment = db.session.query(Exercise.equipment).distinct().all()
-    equipment = [e[0] for e in equipment]
-    
-    custom_workouts = CustomWorkout.query.filter_by(user_id=current_user.id).order_by(CustomWorkout.created_at.desc()).all()
+    custom_workouts = CustomWorkout.query.options(selectinload(CustomWorkout.exercises)).filter_by(user_id=current_user.id).order_by(CustomWorkout.created_at.desc()).all()
     
     return render_template('custom_workouts/workout_designer.html', 
-                         categories=categories,
-                         difficulties=difficulties,
-                         equipment_list=equipment,
+                         categories=exercise_catalog.categories,
+                         difficulties=exercise_catalog.difficulties,
+                         equipment_list=exercise_catalog.equipment,
                          custom_workouts=custom_workouts)
 
 @custom_workouts_bp.route('/api/exercises')
+@budget(1)
 @login_required
 def get_exercises():
     category = request.args.get('category')
     difficulty = request.args.get('difficulty')
     equipment = request.args.get('equipment')
-    search = request.args.get('search', '').lower()
-    
-    query = Exercise.query
+    search = request.args.get('search', '')
     
-    if category:
-        query = query.filter_by(category=category)
-    if difficulty:
-        query = query.filter_by(difficulty=difficulty)
-    if equipment:
-        query = query.filter_by(equipment=equipment)
-    if search:
-        query = query.filter(Exercise.name.ilike(f'%{search}%'))
+    exercises = get_catalog().filter(category=category, difficulty=difficulty,
+                                     equipment=equipment, search=search)
     
-    exercises = query.all()
-    
-    return jsonify([{
-        'id': ex.id,
-        'name': ex.name,
-        'category': ex.category,
-        'muscle_groups': ex.primary_muscle_groups,
-        'equipment': ex.equipment,
-        'difficulty': ex.difficulty,
-        'goal': ex.workout_goal,
-        'location': ex.location
-    } for ex in exercises])
+    return jsonify(exercises)
 
 @custom_workouts_bp.route('/workout-designer/save', methods=['POST'])
+@budget(3)
 @login_required
 def save_custom_workout():
     data = request.get_json()
@@ -76,27 +56,28 @@ def save_custom_workout():
     db.session.add(custom_workout)
     db.session.flush()
     
-    for idx, ex_data in enumerate(exercises):
-        workout_exercise = CustomWorkoutExercise(
-            custom_workout_id=custom_workout.id,
-            exercise_id=ex_data['id'],
-            sets=ex_data.get('sets'),
-            reps=ex_data.get('reps'),
-            duration=ex_data.get('duration'),
-            order=idx,
-            notes=ex_data.get('notes', '')
-        )
-        db.session.add(workout_exercise)
-    
+    # Insert all exercise rows in a single executemany
+    db.session.execute(db.insert(CustomWorkoutExercise).execution_options(render_nulls=True), [{
+        'custom_workout_id': custom_workout.id,
+        'exercise_id': ex_data['id'],
+        'sets': ex_data.get('sets'),
+        'reps': ex_data.get('reps'),
+        'duration': ex_data.get('duration'),
+        'order': idx,
+        'notes': ex_data.get('notes', '')
+    } for idx, ex_data in enumerate(exercises)])
+    
+    workout_id = custom_workout.id
     db.session.commit()
     
     return jsonify({
         'success': True,
         'message': 'Custom workout saved successfully!',
-        'workout_id': custom_workout.id
+        'workout_id': workout_id
     })
 
 @custom_workouts_bp.route('/workout-designer/<int:id>')
+@budget(3)
 @login_required
 def view_custom_workout(id):
     workout = CustomWorkout.query.get_or_404(id)
@@ -105,11 +86,12 @@ def view_custom_workout(id):
         flash('You can only view your own workouts.', 'danger')
         return redirect(url_for('custom_workouts.workout_designer'))
     
-    exercises = CustomWorkoutExercise.query.filter_by(custom_workout_id=id).order_by(CustomWorkoutExercise.order).all()
+    exercises = CustomWorkoutExercise.query.options(joinedload(CustomWorkoutExercise.exercise)).filter_by(custom_workout_id=id).order_by(CustomWorkoutExercise.order).all()
     
     return render_template('custom_workouts/custom_workout_view.html', workout=workout, exercises=exercises)
 
 @custom_workouts_bp.route('/workout-designer/<int:id>/delete', methods=['POST'])
+@budget(7)
 @login_required
 def delete_custom_workout(id):
     workout = CustomWorkout.query.get_or_404(id)
@@ -1,7 +1,9 @@
 from flask import Blueprint, render_template
+from query_budget import budget
 
 main_bp = Blueprint('main', __name__)
 
 @main_bp.route('/')
+@budget(1)
 def index():
     return render_template('main/index.html')
@@ -1,6 +1,8 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload, selectinload
 from models import db, Workout, ScheduledWorkout, WorkoutType, CustomWorkout
+from query_budget import budget
 from forms import ScheduledWorkoutForm
 from datetime import datetime, timedelta
 from collections import defaultdict
@@ -8,6 +10,7 @@ from collections import defaultdict
 schedule_bp = Blueprint('schedule', __name__)
 
 @schedule_bp.route('/schedule')
+@budget(3)
 @login_required
 def schedule():
     week_offset = request.args.get('week', 0, type=int)
@@ -17,7 +20,10 @@ def schedule():
     
     week_dates = [start_of_week + timedelta(days=i) for i in range(7)]
     
-    scheduled_workouts = ScheduledWorkout.query.filter(
+    scheduled_workouts = ScheduledWorkout.query.options(
+        joinedload(ScheduledWorkout.workout_type),
+        joinedload(ScheduledWorkout.custom_workout).selectinload(CustomWorkout.exercises)
+    ).filter(
         ScheduledWorkout.user_id == current_user.id,
         ScheduledWorkout.scheduled_date >= week_dates[0],
         ScheduledWorkout.scheduled_date <= week_dates[6]
@@ -34,6 +40,7 @@ def schedule():
                          week_offset=week_offset)
 
 @schedule_bp.route('/schedule/add', methods=['GET', 'POST'])
+@budget(4)
 @login_required
 def add_scheduled_workout():
     form = ScheduledWorkoutForm()
@@ -67,6 +74,7 @@ def add_scheduled_workout():
     return render_template('schedule/schedule_form.html', form=form)
 
 @schedule_bp.route('/schedule/<int:id>/delete', methods=['POST'])
+@budget(3)
 @login_required
 def delete_scheduled_workout(id):
     scheduled_workout = ScheduledWorkout.query.get_or_404(id)
@@ -81,9 +89,13 @@ def delete_scheduled_workout(id):
     return redirect(url_for('schedule.schedule'))
 
 @schedule_bp.route('/schedule/<int:id>/complete', methods=['POST'])
+@budget(6)
 @login_required
 def complete_scheduled_workout(id):
-    scheduled_workout = ScheduledWorkout.query.get_or_404(id)
+    scheduled_workout = ScheduledWorkout.query.options(
+        joinedload(ScheduledWorkout.workout_type),
+        joinedload(ScheduledWorkout.custom_workout).selectinload(CustomWorkout.exercises)
+    ).get_or_404(id)
     
     if scheduled_workout.user_id != current_user.id:
         flash('You can only complete your own scheduled workouts.', 'danger')
@@ -126,6 +138,7 @@ def complete_scheduled_workout(id):
     return redirect(request.referrer or url_for('schedule.schedule'))
 
 @schedule_bp.route('/schedule/<int:id>/incomplete', methods=['POST'])
+@budget(7)
 @login_required
 def incomplete_scheduled_workout(id):
     scheduled_workout = ScheduledWorkout.query.get_or_404(id)
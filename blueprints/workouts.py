@@ -1,12 +1,15 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload
 from models import db, Workout, ScheduledWorkout
+from query_budget import budget
 from forms import WorkoutForm
 from datetime import datetime, timedelta
 
 workouts_bp = Blueprint('workouts', __name__)
 
 @workouts_bp.route('/dashboard')
+@budget(3)
 @login_required
 def dashboard():
     workouts = Workout.query.filter_by(user_id=current_user.id).order_by(Workout.date.desc()).all()
@@ -14,7 +17,10 @@ def dashboard():
     # Get upcoming scheduled workouts for the next 7 days
     today = datetime.utcnow().date()
     end_date = today + timedelta(days=7)
-    upcoming_workouts = ScheduledWorkout.query.filter(
+    upcoming_workouts = ScheduledWorkout.query.options(
+        joinedload(ScheduledWorkout.workout_type),
+        joinedload(ScheduledWorkout.custom_workout)
+    ).filter(
         ScheduledWorkout.user_id == current_user.id,
         ScheduledWorkout.scheduled_date >= today,
         ScheduledWorkout.scheduled_date <= end_date
@@ -23,6 +29,7 @@ def dashboard():
     return render_template('workouts/dashboard.html', workouts=workouts, upcoming_workouts=upcoming_workouts)
 
 @workouts_bp.route('/workout/new', methods=['GET', 'POST'])
+@budget(2)
 @login_required
 def new_workout():
     form = WorkoutForm()
@@ -42,6 +49,7 @@ def new_workout():
     return render_template('workouts/workout_form.html', form=form, title='Add Workout')
 
 @workouts_bp.route('/workout/<int:id>/edit', methods=['GET', 'POST'])
+@budget(3)
 @login_required
 def edit_workout(id):
     workout = Workout.query.get_or_404(id)
@@ -70,6 +78,7 @@ def edit_workout(id):
     return render_template('workouts/workout_form.html', form=form, title='Edit Workout')
 
 @workouts_bp.route('/workout/<int:id>/delete', methods=['POST'])
+@budget(4)
 @login_required
 def delete_workout(id):
     workout = Workout.query.get_or_404(id)
@@ -84,6 +93,7 @@ def delete_workout(id):
     return redirect(url_for('workouts.dashboard'))
 
 @workouts_bp.route('/stats')
+@budget(2)
 @login_required
 def stats():
     workouts = Workout.query.filter_by(user_id=current_user.id).all()
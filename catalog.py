@@ -0,0 +1,229 @@
+"""
+In-memory exercise catalog.
+
+The exercise library is read-mostly reference data, so it is loaded once into
+an immutable snapshot (and, under gunicorn, once in the master so workers
+share it copy-on-write). Readers grab the current snapshot with
+get_catalog(); reload_catalog() builds a new one and swaps the reference.
+
+The exercises table is kept in step with the spreadsheet by sync_catalog(),
+which applies a keyed diff (by exercise name) instead of reloading the table,
+so CustomWorkoutExercise.exercise_id references stay valid.
+"""
+import hashlib
+import os
+import time
+import pandas as pd
+from flask import current_app
+from models import db, Exercise, CatalogSource
+
+SOURCE_NAME = 'exercises'
+
+# Spreadsheet column -> Exercise attribute
+COLUMNS = {
+    'Category': 'category',
+    'Primary Muscle Groups': 'primary_muscle_groups',
+    'Equipment': 'equipment',
+    'Difficulty': 'difficulty',
+    'Workout Goal': 'workout_goal',
+    'Location': 'location',
+}
+
+# Attributes that may not be blank (NOT NULL columns besides the name)
+REQUIRED = ('category',)
+
+class ExerciseCatalog:
+    """Immutable snapshot of the active exercises plus their filter indexes"""
+
+    def __init__(self, exercises, source_hash=None):
+        self.source_hash = source_hash
+        self.exercises = tuple(self._to_dict(ex) for ex in exercises)
+        self.by_id = {ex['id']: ex for ex in self.exercises}
+        self.categories = self._distinct('category')
+        self.difficulties = self._distinct('difficulty')
+        self.equipment = self._distinct('equipment')
+
+    @staticmethod
+    def _to_dict(ex):
+        return {
+            'id': ex.id,
+            'name': ex.name,
+            'category': ex.category,
+            'muscle_groups': ex.primary_muscle_groups,
+            'equipment': ex.equipment,
+            'difficulty': ex.difficulty,
+            'goal': ex.workout_goal,
+            'location': ex.location
+        }
+
+    def _distinct(self, key):
+        return tuple(dict.fromkeys(ex[key] for ex in self.exercises))
+
+    def filter(self, category=None, difficulty=None, equipment=None, search=''):
+        search = search.lower()
+        return [
+            ex for ex in self.exercises
+            if (not category or ex['category'] == category)
+            and (not difficulty or ex['difficulty'] == difficulty)
+            and (not equipment or ex['equipment'] == equipment)
+            and (not search or search in ex['name'].lower())
+        ]
+
+_catalog = None
+_last_check = 0.0
+_last_stat = None
+
+def load_catalog():
+    """Build a fresh snapshot from the database (requires an app context)"""
+    source = CatalogSource.query.filter_by(name=SOURCE_NAME).first()
+    exercises = Exercise.query.filter_by(is_active=True).order_by(Exercise.id).all()
+    return ExerciseCatalog(exercises, source.content_hash if source else None)
+
+def reload_catalog():
+    """Rebuild the snapshot and atomically replace the current one"""
+    global _catalog
+    _catalog = load_catalog()
+    return _catalog
+
+def get_catalog():
+    """Return the current snapshot, loading it on first use"""
+    if _catalog is None:
+        return reload_catalog()
+    return _catalog
+
+def file_hash(path):
+    """Return the sha256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _clean(value):
+    if pd.isna(value):
+        return None
+    return str(value).strip()
+
+def read_spreadsheet(path):
+    """Read the spreadsheet into ({exercise name: {attribute: value}}, skipped names).
+
+    Rows without a name are ignored; rows missing a required value are skipped
+    with a warning, so one bad row doesn't block the rest of the sync.
+    """
+    df = pd.read_excel(path)
+    rows = {}
+    skipped = set()
+    for index, row in df.iterrows():
+        name = _clean(row['Exercise'])
+        if not name:
+            continue
+        fields = {attr: _clean(row[column]) for column, attr in COLUMNS.items()}
+        missing = [attr for attr in REQUIRED if not fields[attr]]
+        if missing:
+            # +2: one for the header row, one because spreadsheet rows start at 1
+            current_app.logger.warning('Skipping exercise %r on row %d of %s: missing %s',
+                                       name, index + 2, path, ', '.join(missing))
+            skipped.add(name)
+            continue
+        rows[name] = fields
+    return rows, skipped
+
+def diff_catalog(rows, existing, keep=()):
+    """Compute the changes needed to bring the exercise table in line with the spreadsheet.
+
+    Returns (inserts, updates, deactivations) as lists of mappings suitable for
+    bulk_insert_mappings / bulk_update_mappings. Rows are keyed by name; a name
+    that appears more than once in the table keeps its lowest id and the
+    duplicates are deactivated. Existing exercises named in `keep` (rows that
+    were skipped as invalid) are left untouched rather than deactivated.
+    """
+    by_name = {}
+    deactivations = []
+    for ex in sorted(existing, key=lambda ex: ex.id):
+        if ex.name in by_name:
+            if ex.is_active:
+                deactivations.append({'id': ex.id, 'is_active': False})
+        else:
+            by_name[ex.name] = ex
+
+    inserts = []
+    updates = []
+    for name, fields in rows.items():
+        ex = by_name.get(name)
+        if ex is None:
+            inserts.append(dict(fields, name=name, is_active=True))
+            continue
+        changed = {attr: value for attr, value in fields.items() if getattr(ex, attr) != value}
+        if not ex.is_active:
+            changed['is_active'] = True
+        if changed:
+            updates.append(dict(changed, id=ex.id))
+
+    for name, ex in by_name.items():
+        if name not in rows and name not in keep and ex.is_active:
+            deactivations.append({'id': ex.id, 'is_active': False})
+
+    return inserts, updates, deactivations
+
+def sync_catalog(path, force=False):
+    """Apply spreadsheet changes to the exercises table in a single transaction.
+
+    Skips all work when the file's content hash matches the last synced one
+    (unless force is set). Returns (inserted, updated, deactivated) counts, or
+    None if nothing was done. Callers running several processes should hold
+    a lock around this and call reload_catalog() afterwards.
+    """
+    if not os.path.exists(path):
+        return None
+
+    content_hash = file_hash(path)
+    source = CatalogSource.query.filter_by(name=SOURCE_NAME).first()
+    if source and source.content_hash == content_hash and not force:
+        return None
+
+    rows, skipped = read_spreadsheet(path)
+    inserts, updates, deactivations = diff_catalog(rows, Exercise.query.all(), keep=skipped)
+
+    try:
+        db.session.bulk_insert_mappings(Exercise, inserts)
+        db.session.bulk_update_mappings(Exercise, updates + deactivations)
+        if source is None:
+            db.session.add(CatalogSource(name=SOURCE_NAME, content_hash=content_hash))
+        else:
+            source.content_hash = content_hash
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    current_app.logger.info('Synced exercises from %s: %d added, %d updated, %d removed',
+                            path, len(inserts), len(updates), len(deactivations))
+    return len(inserts), len(updates), len(deactivations)
+
+def source_changed(path, interval):
+    """Cheaply check whether the spreadsheet differs from the current snapshot.
+
+    Only stats the file, at most once per `interval` seconds, and hashes it
+    only when its size or mtime moved.
+    """
+    global _last_check, _last_stat
+    now = time.monotonic()
+    if now - _last_check < interval:
+        return False
+    _last_check = now
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    stat_key = (st.st_mtime_ns, st.st_size)
+    if stat_key == _last_stat:
+        return False
+    _last_stat = stat_key
+
+    return file_hash(path) != get_catalog().source_hash
+
+def mark_check_failed():
+    """Forget the last seen file state so the next check retries the sync"""
+    global _last_stat
+    _last_stat = None
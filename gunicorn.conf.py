@@ -0,0 +1,44 @@
+"""
+Gunicorn configuration.
+
+Loads the app in the master (preload_app) so the one-time bootstrap runs
+before any worker forks and templates/catalog are shared copy-on-write, and
+logs each worker's startup time and memory footprint once it is ready.
+"""
+import os
+import time
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+preload_app = True
+
+def _memory_kb():
+    """Return (rss, pss) in kB for the current process, None where /proc is unavailable"""
+    rss = pss = None
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    rss = int(line.split()[1])
+                    break
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    pss = int(line.split()[1])
+                    break
+    except OSError:
+        pass
+    return rss, pss
+
+def pre_fork(server, worker):
+    worker.fork_started = time.monotonic()
+
+def post_worker_init(worker):
+    startup_ms = (time.monotonic() - worker.fork_started) * 1000
+    rss, pss = _memory_kb()
+    worker.log.info(
+        'Worker %s ready in %.1f ms (RSS %s kB, PSS %s kB)',
+        worker.pid, startup_ms,
+        rss if rss is not None else 'n/a',
+        pss if pss is not None else 'n/a'
+    )
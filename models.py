@@ -85,10 +85,22 @@ class Exercise(db.Model):
     difficulty = db.Column(db.String(20))
     workout_goal = db.Column(db.String(50))
     location = db.Column(db.String(50))
+    is_active = db.Column(db.Boolean, nullable=False, default=True)  # False once removed from the spreadsheet
     
     def __repr__(self):
         return f'<Exercise {self.name}>'
 
+class CatalogSource(db.Model):
+    __tablename__ = 'catalog_sources'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)  # sha256 of the last synced file
+    synced_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<CatalogSource {self.name}>'
+
 class CustomWorkout(db.Model):
     __tablename__ = 'custom_workouts'
     
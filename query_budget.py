@@ -0,0 +1,82 @@
+"""
+Per-endpoint SQL query budgets, enforced in test mode.
+
+Every view declares how many SQL statements a request to it may issue:
+
+    @workouts_bp.route('/dashboard')
+    @budget(3)
+    @login_required
+    def dashboard():
+        ...
+
+With QUERY_BUDGET enabled, each request counts the statements it executes
+(via engine events) and raises QueryBudgetExceeded, listing the statements,
+when it goes over its endpoint's budget or hits a view with no budget. With
+QUERY_BUDGET_RAISELOAD also enabled, every ORM query in the request gets
+raiseload('*'), so any relationship that isn't eagerly loaded raises on
+access instead of quietly issuing another query.
+"""
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import raiseload
+from models import db
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request issues more SQL statements than its endpoint allows"""
+
+    def __init__(self, endpoint, budget, statements):
+        self.endpoint = endpoint
+        self.budget = budget
+        self.statements = statements
+        if budget is None:
+            summary = f'{endpoint} has no query budget declared'
+        else:
+            summary = f'{endpoint} issued {len(statements)} queries, budget is {budget}'
+        lines = [f'  {i}. {statement}' for i, statement in enumerate(statements, 1)]
+        super().__init__('\n'.join([summary] + lines))
+
+def budget(max_queries):
+    """Declare the maximum number of SQL statements a request to this view may issue"""
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+def _counting():
+    return has_request_context() and g.get('query_log') is not None
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    if _counting():
+        g.query_log.append(statement)
+
+def _add_raiseload(orm_execute_state):
+    if _counting() and g.get('query_raiseload') and orm_execute_state.is_select:
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload('*'))
+
+def init_app(app):
+    """Register the counting hooks; they stay inert unless QUERY_BUDGET is set"""
+    app.config.setdefault('QUERY_BUDGET', False)
+    app.config.setdefault('QUERY_BUDGET_RAISELOAD', False)
+
+    if not event.contains(Engine, 'before_cursor_execute', _record_statement):
+        event.listen(Engine, 'before_cursor_execute', _record_statement)
+    if not event.contains(db.session, 'do_orm_execute', _add_raiseload):
+        event.listen(db.session, 'do_orm_execute', _add_raiseload)
+
+    @app.before_request
+    def start_query_budget():
+        if app.config['QUERY_BUDGET'] and request.endpoint not in (None, 'static'):
+            g.query_log = []
+            g.query_raiseload = app.config['QUERY_BUDGET_RAISELOAD']
+
+    @app.after_request
+    def check_query_budget(response):
+        statements = g.pop('query_log', None)
+        if statements is None:
+            return response
+        view = app.view_functions[request.endpoint]
+        max_queries = getattr(view, 'query_budget', None)
+        if max_queries is None or len(statements) > max_queries:
+            raise QueryBudgetExceeded(request.endpoint, max_queries, statements)
+        return response
@@ -0,0 +1,127 @@
+"""
+Tests for the keyed exercise catalog sync in catalog.py.
+"""
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import catalog
+from app import create_app
+from catalog import diff_catalog, sync_catalog
+from models import db, User, Exercise, CustomWorkout, CustomWorkoutExercise
+
+FIELDS = {
+    'category': 'Core',
+    'primary_muscle_groups': 'Abs',
+    'equipment': 'Bodyweight',
+    'difficulty': 'Beginner',
+    'workout_goal': 'Stability',
+    'location': 'Home',
+}
+
+def existing(id, name, is_active=True, **fields):
+    """Stand-in for an Exercise row"""
+    return SimpleNamespace(id=id, name=name, is_active=is_active, **dict(FIELDS, **fields))
+
+def test_diff_inserts_new_names():
+    inserts, updates, deactivations = diff_catalog({'Plank': dict(FIELDS)}, [])
+    assert inserts == [dict(FIELDS, name='Plank', is_active=True)]
+    assert updates == [] and deactivations == []
+
+def test_diff_unchanged_rows_produce_nothing():
+    assert diff_catalog({'Plank': dict(FIELDS)}, [existing(1, 'Plank')]) == ([], [], [])
+
+def test_diff_updates_only_changed_fields():
+    rows = {'Plank': dict(FIELDS, difficulty='Advanced')}
+    inserts, updates, deactivations = diff_catalog(rows, [existing(1, 'Plank')])
+    assert updates == [{'id': 1, 'difficulty': 'Advanced'}]
+    assert inserts == [] and deactivations == []
+
+def test_diff_soft_deletes_missing_names():
+    rows = {'Plank': dict(FIELDS)}
+    _, _, deactivations = diff_catalog(rows, [existing(1, 'Plank'), existing(2, 'Squat'),
+                                              existing(3, 'Lunge', is_active=False)])
+    assert deactivations == [{'id': 2, 'is_active': False}]
+
+def test_diff_reactivates_returning_names():
+    _, updates, _ = diff_catalog({'Plank': dict(FIELDS)}, [existing(1, 'Plank', is_active=False)])
+    assert updates == [{'id': 1, 'is_active': True}]
+
+def test_diff_keeps_lowest_id_for_duplicate_names():
+    rows = {'Plank': dict(FIELDS, location='Gym')}
+    inserts, updates, deactivations = diff_catalog(rows, [
+        existing(5, 'Plank'), existing(2, 'Plank'), existing(7, 'Plank', is_active=False)])
+    assert inserts == []
+    assert updates == [{'id': 2, 'location': 'Gym'}]
+    assert deactivations == [{'id': 5, 'is_active': False}]
+
+def test_diff_leaves_kept_names_untouched():
+    _, _, deactivations = diff_catalog({}, [existing(1, 'Plank')], keep={'Plank'})
+    assert deactivations == []
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'TESTING': True,
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+    catalog._catalog = None
+
+def write_spreadsheet(path, rows):
+    """Write rows of (name, {attribute: value}) in the layout of the real spreadsheet"""
+    columns = {attr: column for column, attr in catalog.COLUMNS.items()}
+    pd.DataFrame([
+        dict({'Exercise': name}, **{columns[attr]: value for attr, value in dict(FIELDS, **fields).items()})
+        for name, fields in rows
+    ]).to_excel(path, index=False)
+
+def test_sync_round_trip_keeps_referenced_ids(app, tmp_path):
+    path = tmp_path / 'exercises.xlsx'
+    write_spreadsheet(path, [('Plank', {}), ('Squat', {'category': 'Lower Body'}), ('Lunge', {})])
+    assert sync_catalog(path) == (3, 0, 0)
+
+    ids = {ex.name: ex.id for ex in Exercise.query.all()}
+    user = User(username='bob', email='bob@example.com', password='x')
+    db.session.add(user)
+    db.session.flush()
+    workout = CustomWorkout(name='Legs', user_id=user.id)
+    db.session.add(workout)
+    db.session.flush()
+    for order, name in enumerate(('Plank', 'Squat', 'Lunge')):
+        db.session.add(CustomWorkoutExercise(custom_workout_id=workout.id, exercise_id=ids[name], order=order))
+    db.session.commit()
+
+    # Edit Plank, drop Squat, add Burpee
+    write_spreadsheet(path, [('Plank', {'difficulty': 'Advanced'}), ('Lunge', {}), ('Burpee', {})])
+    assert sync_catalog(path) == (1, 1, 1)
+    assert sync_catalog(path) is None  # unchanged content hash
+
+    db.session.expire_all()
+    exercises = {ex.name: ex for ex in Exercise.query.all()}
+    assert {name: exercises[name].id for name in ids} == ids
+    assert exercises['Plank'].difficulty == 'Advanced'
+    assert not exercises['Squat'].is_active
+    assert exercises['Burpee'].is_active
+    linked = CustomWorkoutExercise.query.order_by(CustomWorkoutExercise.order).all()
+    assert [cwe.exercise.name for cwe in linked] == ['Plank', 'Squat', 'Lunge']
+
+    names = [ex['name'] for ex in catalog.reload_catalog().exercises]
+    assert names == ['Plank', 'Lunge', 'Burpee']
+
+def test_sync_skips_rows_missing_required_values(app, tmp_path):
+    path = tmp_path / 'exercises.xlsx'
+    write_spreadsheet(path, [('Plank', {}), ('Squat', {})])
+    sync_catalog(path)
+
+    write_spreadsheet(path, [('Plank', {'category': None}), ('Squat', {}), ('Burpee', {'category': None})])
+    assert sync_catalog(path) == (0, 0, 0)
+
+    exercises = {ex.name: ex for ex in Exercise.query.all()}
+    assert set(exercises) == {'Plank', 'Squat'}
+    assert exercises['Plank'].is_active and exercises['Plank'].category == 'Core'
@@ -0,0 +1,128 @@
+"""
+Regression guard for the per-route query budgets in query_budget.py.
+
+Runs every route against a seeded temporary database with QUERY_BUDGET and
+QUERY_BUDGET_RAISELOAD enabled, so an N+1 or an undeclared relationship
+load fails the suite with the offending statements listed.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from flask import g
+from sqlalchemy.exc import InvalidRequestError
+from werkzeug.security import generate_password_hash
+
+from app import create_app, bootstrap
+from models import db, User, Workout, ScheduledWorkout, CustomWorkout, CustomWorkoutExercise
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'TESTING': True,
+        'WTF_CSRF_ENABLED': False,
+        'QUERY_BUDGET': True,
+        'QUERY_BUDGET_RAISELOAD': True,
+    })
+    bootstrap(app)
+    with app.app_context():
+        seed()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+def seed():
+    """One user with workouts, three custom workouts and a week of scheduled instances"""
+    user = User(username='bob', email='bob@example.com',
+                password=generate_password_hash('secret1', method='pbkdf2:sha256'))
+    db.session.add(user)
+    db.session.flush()
+
+    today = datetime.utcnow().date()
+    for i in range(3):
+        db.session.add(Workout(exercise=f'Run {i}', duration=30, calories=300,
+                               date=today - timedelta(days=i), user_id=user.id))
+
+    for i in range(3):
+        custom_workout = CustomWorkout(name=f'Custom {i}', user_id=user.id)
+        db.session.add(custom_workout)
+        db.session.flush()
+        for order, exercise_id in enumerate((1, 2, 3)):
+            db.session.add(CustomWorkoutExercise(custom_workout_id=custom_workout.id,
+                                                 exercise_id=exercise_id, sets=3, order=order))
+        db.session.add(ScheduledWorkout(custom_workout_id=custom_workout.id,
+                                        scheduled_date=today + timedelta(days=i), user_id=user.id))
+        db.session.add(ScheduledWorkout(workout_type_id=i + 1,
+                                        scheduled_date=today + timedelta(days=i), user_id=user.id))
+    db.session.commit()
+
+def route_requests():
+    """(method, url, kwargs) for every route, in an order where each one has data to act on"""
+    today = datetime.utcnow().date().isoformat()
+    workout = dict(exercise='Swim', duration=20, calories=150, notes='', date=today)
+    return [
+        ('get', '/', {}),
+        ('get', '/register', {}),
+        ('post', '/register', dict(data=dict(username='alice', email='alice@example.com',
+                                             password='secret1', confirm_password='secret1'))),
+        ('get', '/login', {}),
+        ('post', '/login', dict(data=dict(username='bob', password='secret1'))),
+        # Logged in: these now load the user and render or redirect differently
+        ('get', '/', {}),
+        ('get', '/login', {}),
+        ('get', '/register', {}),
+        ('get', '/dashboard', {}),
+        ('get', '/stats', {}),
+        ('get', '/workout/new', {}),
+        ('post', '/workout/new', dict(data=workout)),
+        ('get', '/workout/1/edit', {}),
+        ('post', '/workout/1/edit', dict(data=workout)),
+        ('get', '/workout-designer', {}),
+        ('get', '/api/exercises?category=Core&search=pl', {}),
+        ('post', '/workout-designer/save', dict(json=dict(name='Legs', exercises=[
+            dict(id=7, sets=3, reps=10), dict(id=8, duration=5), dict(id=9)]))),
+        ('get', '/workout-designer/1', {}),
+        ('get', '/schedule', {}),
+        ('get', '/schedule/add', {}),
+        ('post', '/schedule/add', dict(data=dict(workout_type=1, custom_workout=0,
+                                                 scheduled_date=today, notes=''))),
+        ('post', '/schedule/1/complete', {}),
+        ('post', '/schedule/2/complete', {}),
+        ('post', '/schedule/1/incomplete', {}),
+        ('post', '/schedule/3/delete', {}),
+        ('post', '/workout/2/delete', {}),
+        ('post', '/workout-designer/1/delete', {}),
+        ('get', '/logout', {}),
+    ]
+
+def test_every_route_stays_within_its_query_budget(app):
+    client = app.test_client()
+    adapter = app.url_map.bind('localhost')
+    hit = set()
+
+    for method, url, kwargs in route_requests():
+        # QueryBudgetExceeded propagates out of the test client in TESTING mode
+        response = getattr(client, method)(url, **kwargs)
+        assert response.status_code in (200, 302), f'{method.upper()} {url} returned {response.status_code}'
+        endpoint, _ = adapter.match(url.split('?')[0], method=method.upper())
+        hit.add(endpoint)
+
+    endpoints = {rule.endpoint for rule in app.url_map.iter_rules() if rule.endpoint != 'static'}
+    assert endpoints - hit == set(), 'routes not exercised by this test'
+
+def test_every_route_declares_a_query_budget(app):
+    missing = [
+        rule.endpoint for rule in app.url_map.iter_rules()
+        if rule.endpoint != 'static'
+        and getattr(app.view_functions[rule.endpoint], 'query_budget', None) is None
+    ]
+    assert missing == []
+
+def test_lazy_relationship_load_raises(app):
+    with app.test_request_context('/schedule'):
+        app.preprocess_request()
+        assert g.query_raiseload
+        scheduled = ScheduledWorkout.query.filter(ScheduledWorkout.custom_workout_id.isnot(None)).first()
+        with pytest.raises(InvalidRequestError):
+            scheduled.custom_workout
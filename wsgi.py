@@ -0,0 +1,19 @@
+"""
+WSGI entry point for production servers, e.g.:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app enabled (see gunicorn.conf.py) this module is imported once
+in the gunicorn master, so bootstrap and preloading happen before workers fork.
+"""
+import logging
+from app import app, bootstrap, preload
+
+# Send app.logger (e.g. exercise catalog syncs) to gunicorn's error log
+gunicorn_logger = logging.getLogger('gunicorn.error')
+if gunicorn_logger.handlers:
+    app.logger.handlers = gunicorn_logger.handlers
+    app.logger.setLevel(gunicorn_logger.level)
+
+bootstrap(app)
+preload(app)